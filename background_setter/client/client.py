@@ -5,6 +5,7 @@ import re
 import uuid
 import zoneinfo
 from dataclasses import fields
+from typing import Optional
 
 from screen.screen_orientation import ScreenOrientation
 from used_images.available_images import ImagesList
@@ -31,7 +32,7 @@ class BackgroundSetterClient:
             dataclass_from_dict(klass, dikt): Convert a dictionary to a dataclass instance.
             initialize_device_id(): Initialize a unique device ID.
             initialize_used_images(): Initialize the used images dictionary.
-            get_available_images(all_images, orientation): Get a list of available images.
+            get_available_images(all_images, orientation, duplicates): Get a list of available images.
             update_used_images(image_path, orientation): Update the list of used images.
             update_used_images_last_update(): Update the last update date of used images.
             dump_update_used_images(): Dump the used images into a JSON file.
@@ -78,17 +79,29 @@ class BackgroundSetterClient:
             used_images = json.load(f)
         return self.dataclass_from_dict(UsedImages, used_images)
 
-    def get_available_images(self, all_images: list[str | pathlib.Path] , orientation: ScreenOrientation) -> list[str]:
+    def get_available_images(self, all_images: list[str | pathlib.Path], orientation: ScreenOrientation,
+                             duplicates: Optional[dict[str, str]] = None) -> list[str]:
         """Get a list of available images by removing the used images based on the given screen orientation.
 
+        Near-duplicate images are treated as a single entry: only the representative of each group is returned, and a
+        group is not available anymore once any of its images has been used.
+
         :param all_images: A list of strings representing the file names of all available images.
         :param orientation: Represents the orientation of a screen. It can be HORIZONTAL or VERTICAL.
+        :param duplicates: An optional dictionary mapping each image to the representative of its group of
+            near-duplicates, as returned by `DuplicateIndex.group`. Images missing from it are their own group.
         """
         used_images: set[str] = set(self.used_images.images.horizontal) if orientation == ScreenOrientation.HORIZONTAL \
             else set(self.used_images.images.vertical)
+        if not duplicates:
+            available_images: list[str] = list(set(all_images).difference(used_images))
+            return available_images or all_images
+
+        used_groups: set[str] = {duplicates.get(image, image) for image in used_images}
+        representatives: set[str] = {duplicates.get(str(image), str(image)) for image in all_images}
 
-        available_images: list[str] = list(set(all_images).difference(used_images))
-        return available_images or all_images
+        available_images: list[str] = list(representatives.difference(used_groups))
+        return available_images or list(representatives)
 
     def update_used_images(self, image_path: str, orientation: ScreenOrientation) -> None:
         """Update a list of used images based on their orientation.
@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+import pathlib
+import tempfile
+from typing import Optional
+
+from duplicates.hash_algorithm import HashAlgorithm
+from duplicates.multi_index_hash import MultiIndexHash
+from duplicates.perceptual_hash import HASH_FUNCTIONS, compute_hash
+from image_source.image_source import ImageSource
+
+
+class DuplicateIndex:
+    """A persistent index of the perceptual hashes of the images, used to detect near-duplicates.
+
+    The index is updated incrementally while scanning the image sources: an image is only decoded again if the size or
+    the modification time of its local file changed. Images of remote sources are only hashed once they are in the
+    local cache, until then they are considered unique.
+
+    Args:
+        index_path (pathlib.Path): The path to the JSON file where the hashes are stored.
+        algorithm (str): The perceptual hash algorithm, a value of the `HashAlgorithm` class. Unknown values fall back
+            to `HashAlgorithm.DHASH`.
+        max_distance (int): The maximum Hamming distance between the hashes of two near-duplicate images.
+
+    Attributes:
+        index_path (pathlib.Path): The path to the JSON file where the hashes are stored.
+        algorithm (str): The perceptual hash algorithm, a value of the `HashAlgorithm` class.
+        max_distance (int): The maximum Hamming distance between the hashes of two near-duplicate images.
+        entries (dict[str, dict[str, int | str]]): The hash of each image, along with the local path, size and
+            modification time of the file it was computed from.
+        changed (bool): Whether the entries changed since they were loaded, i.e. whether the file must be rewritten.
+    """
+
+    def __init__(self, index_path: pathlib.Path, algorithm: str = HashAlgorithm.DHASH, max_distance: int = 6) -> None:
+        self.index_path: pathlib.Path = index_path.expanduser()
+        self.algorithm: str = self.validate_algorithm(algorithm)
+        self.max_distance: int = max_distance
+        self.changed: bool = False
+        self.entries: dict[str, dict[str, int | str]] = self.load_entries()
+
+    @staticmethod
+    def validate_algorithm(algorithm: str) -> str:
+        """Check that the hash algorithm is supported, ignoring its case.
+
+        :param algorithm: The name of the hash algorithm, e.g. as read from the configuration file.
+        :return: The normalized algorithm, or `HashAlgorithm.DHASH` if the algorithm is not supported.
+        """
+        if (normalized := algorithm.strip().lower()) in HASH_FUNCTIONS:
+            return normalized
+
+        logging.warning(f'Unknown hash algorithm {algorithm!r}, expected one of {", ".join(HASH_FUNCTIONS)}. '
+                        f'Using {HashAlgorithm.DHASH}')
+        return HashAlgorithm.DHASH
+
+    def load_entries(self) -> dict[str, dict[str, int | str]]:
+        """Load the hashes from the index file, discarding them if they were computed with another algorithm.
+
+        A corrupted index file is discarded too, the images will simply be hashed again.
+
+        :return: A dictionary mapping image names to their hash entry.
+        """
+        if not self.index_path.exists():
+            return {}
+
+        try:
+            with self.index_path.open('r', encoding='utf-8') as f:
+                data: dict = json.load(f)
+        except json.JSONDecodeError as e:
+            logging.warning(f'Cannot read the hash index {self.index_path}, starting with an empty one: {e}')
+            self.changed = True
+            return {}
+
+        if data.get('algorithm') != self.algorithm:
+            self.changed = True
+            return {}
+        return data.get('entries', {})
+
+    def dump_entries(self) -> None:
+        """Dump the hashes into the index file, dropping the ones whose local file does not exist anymore.
+
+        The file is only rewritten if the entries changed. It is written to a temporary file first and then moved over
+        the old one, so a run killed while writing never leaves a truncated index.
+
+        :return: `None`.
+        """
+        entries: dict[str, dict[str, int | str]] = {name: entry for name, entry in self.entries.items()
+                                                     if pathlib.Path(entry['path']).exists()}
+        if len(entries) != len(self.entries):
+            self.entries, self.changed = entries, True
+        if not self.changed:
+            return
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.index_path.parent, suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'algorithm': self.algorithm, 'entries': self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_name, self.index_path)
+        except BaseException:
+            pathlib.Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self.changed = False
+
+    def update(self, source: ImageSource, images: list[str]) -> None:
+        """Hash the images that are new or changed since the last update.
+
+        :param source: The image source the images belong to.
+        :param images: The names of the images, as returned by the source.
+        :return: `None`.
+        """
+        for image_name in images:
+            if (path := source.get_local_path(image_name)) is None:
+                continue
+
+            stat: os.stat_result = path.stat()
+            entry: Optional[dict[str, int | str]] = self.entries.get(image_name)
+            if entry is not None and entry['path'] == str(path) and entry['size'] == stat.st_size \
+                    and entry['mtime'] == stat.st_mtime_ns:
+                continue
+
+            if (image_hash := compute_hash(path, self.algorithm)) is None:
+                logging.warning(f'Cannot compute the hash of {image_name}')
+                self.changed |= self.entries.pop(image_name, None) is not None
+                continue
+
+            self.entries[image_name] = {'path': str(path), 'size': stat.st_size, 'mtime': stat.st_mtime_ns,
+                                        'hash': image_hash}
+            self.changed = True
+
+    def group(self, source: ImageSource, images: list[str]) -> dict[str, str]:
+        """Group the given images into sets of near-duplicates.
+
+        Images with the same hash are merged first, then the distinct hashes are visited in order: each hash not yet
+        in a group becomes the root of a new group, and every hash within `max_distance` of it that is not yet in a
+        group joins it. The lookups go through a multi-index hash table, so the cost grows with the number of images
+        times the cost of a lookup instead of comparing every pair. Every image is within `max_distance` of the root of
+        its group, so chains of slightly different images, e.g. dark or gradient wallpapers, cannot merge into one
+        large group.
+
+        :param source: The image source the images belong to.
+        :param images: The names of the images to group.
+        :return: A dictionary mapping every image to the name of the representative of its group, images without a
+            hash being their own representative. The representative is an image already available locally if the
+            group has any, so that picking it does not need a download.
+        """
+        images_by_hash: dict[int, list[str]] = {}
+        for image_name in images:
+            if (entry := self.entries.get(image_name)) is not None:
+                images_by_hash.setdefault(entry['hash'], []).append(image_name)
+
+        index: MultiIndexHash = MultiIndexHash()
+        for image_hash in images_by_hash:
+            index.add(image_hash)
+
+        roots: dict[int, int] = {}
+        for image_hash in sorted(images_by_hash):
+            if image_hash in roots:
+                continue
+            for match in index.search(image_hash, self.max_distance):
+                roots.setdefault(match, image_hash)
+
+        members: dict[int, list[str]] = {}
+        for image_hash, names in images_by_hash.items():
+            members.setdefault(roots[image_hash], []).extend(names)
+
+        groups: dict[str, str] = {image_name: image_name for image_name in images}
+        for names in members.values():
+            if len(names) == 1:
+                continue
+            local_names: list[str] = [image_name for image_name in names
+                                      if source.get_local_path(image_name) is not None]
+            representative: str = min(local_names or names)
+            groups.update((image_name, representative) for image_name in names)
+        return groups
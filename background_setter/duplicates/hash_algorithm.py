@@ -0,0 +1,3 @@
+class HashAlgorithm:
+    DHASH: str = 'dhash'
+    PHASH: str = 'phash'
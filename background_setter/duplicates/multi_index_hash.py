@@ -0,0 +1,74 @@
+import functools
+import itertools
+
+
+@functools.lru_cache(maxsize=None)
+def flip_masks(bits: int, max_flips: int) -> tuple[int, ...]:
+    """Return the masks flipping at most `max_flips` of the given number of bits.
+
+    :param bits: The number of bits of the values to flip.
+    :param max_flips: The maximum number of bits to flip.
+    :return: The masks to xor with a value to get all the values within distance `max_flips` of it.
+    """
+    return tuple(sum(1 << bit for bit in flipped)
+                 for distance in range(max_flips + 1)
+                 for flipped in itertools.combinations(range(bits), distance))
+
+
+class MultiIndexHash:
+    """An index of 64 bits hashes supporting fast lookups by Hamming distance.
+
+    Every hash is split into `64 / chunk_bits` chunks and each chunk is indexed in its own table. If two hashes are
+    within distance `d`, by the pigeonhole principle at least one of their chunks is within distance
+    `d // number of chunks`, so a search only needs to probe the few chunk values close to the ones of the query and
+    to check the hashes found there, instead of comparing the query with every hash.
+
+    Args:
+        chunk_bits (int): The number of bits of each chunk.
+
+    Attributes:
+        chunk_bits (int): The number of bits of each chunk.
+        chunks (int): The number of chunks each hash is split into.
+        tables (list[dict[int, list[int]]]): For every chunk, the hashes indexed by the value of that chunk.
+    """
+
+    HASH_BITS: int = 64
+
+    def __init__(self, chunk_bits: int = 16) -> None:
+        self.chunk_bits: int = chunk_bits
+        self.chunks: int = self.HASH_BITS // chunk_bits
+        self.tables: list[dict[int, list[int]]] = [{} for _ in range(self.chunks)]
+
+    def split(self, value: int) -> list[int]:
+        """Split a hash into its chunks.
+
+        :param value: The hash to split.
+        :return: The values of the chunks, the least significant first.
+        """
+        mask: int = (1 << self.chunk_bits) - 1
+        return [(value >> (i * self.chunk_bits)) & mask for i in range(self.chunks)]
+
+    def add(self, value: int) -> None:
+        """Add a hash to the index.
+
+        :param value: The hash to add.
+        :return: `None`.
+        """
+        for table, chunk in zip(self.tables, self.split(value)):
+            table.setdefault(chunk, []).append(value)
+
+    def search(self, value: int, max_distance: int) -> set[int]:
+        """Find all the hashes within the given Hamming distance of a hash.
+
+        :param value: The hash to look for.
+        :param max_distance: The maximum Hamming distance of the hashes to return.
+        :return: The hashes in the index whose distance from `value` is at most `max_distance`.
+        """
+        flips: tuple[int, ...] = flip_masks(self.chunk_bits, max_distance // self.chunks)
+        matches: set[int] = set()
+        for table, chunk in zip(self.tables, self.split(value)):
+            for flip in flips:
+                if candidates := table.get(chunk ^ flip):
+                    matches.update(candidate for candidate in candidates
+                                   if (value ^ candidate).bit_count() <= max_distance)
+        return matches
@@ -0,0 +1,74 @@
+import pathlib
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from duplicates.hash_algorithm import HashAlgorithm
+
+
+def read_reduced_grayscale(image_path: pathlib.Path) -> Optional[np.ndarray]:
+    """Read an image as grayscale at 1/8 of its resolution.
+
+    For JPEG images OpenCV scales the image while decoding it, which is much faster than decoding it at full size and
+    resizing it afterwards. The perceptual hashes only need a few pixels, so nothing is lost.
+
+    :param image_path: The path of the image to read.
+    :return: The reduced grayscale image, or `None` if the image cannot be read.
+    """
+    return cv2.imread(str(image_path), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+
+
+def bits_to_int(bits: np.ndarray) -> int:
+    """Pack an array of booleans into an integer, the first element being the most significant bit.
+
+    :param bits: The array of booleans.
+    :return: The integer whose binary representation is given by `bits`.
+    """
+    return int.from_bytes(np.packbits(bits.flatten()).tobytes(), 'big')
+
+
+def dhash(image: np.ndarray) -> int:
+    """Compute the 64 bits difference hash of a grayscale image.
+
+    Each bit tells whether a pixel of the image, shrunk to 9x8, is brighter than its left neighbour.
+
+    :param image: The grayscale image.
+    :return: The difference hash of the image.
+    """
+    small: np.ndarray = cv2.resize(image, (9, 8), interpolation=cv2.INTER_AREA)
+    return bits_to_int(small[:, 1:] > small[:, :-1])
+
+
+def phash(image: np.ndarray) -> int:
+    """Compute the 64 bits perceptual hash of a grayscale image.
+
+    Each bit tells whether one of the 8x8 lowest frequencies of the discrete cosine transform of the image, shrunk to
+    32x32, is above their median.
+
+    :param image: The grayscale image.
+    :return: The perceptual hash of the image.
+    """
+    small: np.ndarray = cv2.resize(image, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low_frequencies: np.ndarray = cv2.dct(small)[:8, :8]
+    return bits_to_int(low_frequencies > np.median(low_frequencies.flatten()[1:]))
+
+
+HASH_FUNCTIONS: dict[str, Callable[[np.ndarray], int]] = {
+    HashAlgorithm.DHASH: dhash,
+    HashAlgorithm.PHASH: phash,
+}
+
+
+def compute_hash(image_path: pathlib.Path, algorithm: str = HashAlgorithm.DHASH) -> Optional[int]:
+    """Compute the perceptual hash of an image file.
+
+    :param image_path: The path of the image.
+    :param algorithm: The hash algorithm, a value of the `HashAlgorithm` class.
+    :return: The 64 bits hash of the image, or `None` if the image cannot be read.
+    """
+    image: Optional[np.ndarray] = read_reduced_grayscale(image_path)
+    if image is None or image.size == 0:
+        return None
+    return HASH_FUNCTIONS[algorithm](image)
+
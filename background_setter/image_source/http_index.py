@@ -0,0 +1,38 @@
+import html.parser
+import urllib.parse
+
+from image_source.remote_source import RemoteImageSource
+
+
+class LinkParser(html.parser.HTMLParser):
+    """An HTML parser collecting the targets of all the links in a page."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.links: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == 'a' and (href := dict(attrs).get('href')):
+            self.links.append(href)
+
+
+class HTTPIndexSource(RemoteImageSource):
+    """
+    An image source reading a plain HTTP directory index, such as the ones generated by nginx `autoindex`, Apache
+    `mod_autoindex` or `python -m http.server`.
+    """
+
+    def list_remote_images(self) -> list[str]:
+        """
+        This function downloads the index page and returns the urls of all the linked images.
+        :return: A list of strings, where each string is the url of an image linked by the index page.
+        """
+        parser: LinkParser = LinkParser()
+        parser.feed(self.session.get(self.url).decode('utf-8', errors='replace'))
+
+        images_available: set[str] = set()
+        for link in parser.links:
+            url: str = urllib.parse.urljoin(self.url, link)
+            if self.is_image(urllib.parse.urlsplit(url).path):
+                images_available.add(url)
+        return list(images_available)
@@ -0,0 +1,209 @@
+import base64
+import http.client
+import logging
+import netrc
+import urllib.parse
+from typing import Iterator, Optional
+
+
+class HTTPSession:
+    """A minimal HTTP client that keeps one persistent connection per host.
+
+    Listing a remote library and downloading several images from it would otherwise open a new TCP (and TLS)
+    connection for every request. The connections opened here are kept alive and reused until the session is closed.
+
+    Args:
+        timeout (float): The timeout in seconds for every connection.
+
+    Attributes:
+        timeout (float): The timeout in seconds for every connection.
+        connections (dict[tuple[str, str, int | None], http.client.HTTPConnection]): The open connections, keyed by
+            scheme, host and port.
+        credentials (dict[str, tuple[str, str] | None]): The username and password to use for each host, `None` for the
+            hosts known to have no credentials.
+    """
+
+    CHUNK_SIZE: int = 64 * 1024
+
+    def __init__(self, timeout: float = 30.0) -> None:
+        self.timeout: float = timeout
+        self.connections: dict[tuple[str, str, Optional[int]], http.client.HTTPConnection] = {}
+        self.credentials: dict[str, Optional[tuple[str, str]]] = {}
+
+    def __enter__(self) -> 'HTTPSession':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close all the open connections.
+
+        :return: `None`.
+        """
+        for connection in self.connections.values():
+            connection.close()
+        self.connections.clear()
+
+    def get_connection(self, url: urllib.parse.SplitResult) -> http.client.HTTPConnection:
+        """Return the open connection for the host of the given url, opening a new one if needed.
+
+        :param url: The url to connect to.
+        :return: An `http.client.HTTPConnection` (or `HTTPSConnection`) connected to the url host.
+        """
+        key: tuple[str, str, Optional[int]] = (url.scheme, url.hostname, url.port)
+        if key not in self.connections:
+            connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+            self.connections[key] = connection_class(url.hostname, url.port, timeout=self.timeout)
+        return self.connections[key]
+
+    def add_credentials(self, hostname: str, username: str, password: str) -> None:
+        """Register the credentials to use for the given host.
+
+        :param hostname: The host the credentials belong to.
+        :param username: The username.
+        :param password: The password.
+        :return: `None`.
+        """
+        self.credentials[hostname] = (username, password)
+
+    def get_authorization(self, url: urllib.parse.SplitResult) -> Optional[str]:
+        """Build the basic authorization header for the given url.
+
+        Credentials are taken from the ones registered with `add_credentials`, otherwise from the user's `~/.netrc`,
+        which is only read once per host.
+
+        :param url: The url to authenticate against.
+        :return: The value of the `Authorization` header, or `None` if no credentials are available.
+        """
+        if url.hostname not in self.credentials:
+            try:
+                authenticators: Optional[tuple[str, str, str]] = netrc.netrc().authenticators(url.hostname)
+            except (FileNotFoundError, netrc.NetrcParseError):
+                authenticators = None
+            self.credentials[url.hostname] = None if authenticators is None else (authenticators[0], authenticators[2])
+
+        if self.credentials[url.hostname] is None:
+            return None
+
+        username, password = self.credentials[url.hostname]
+        credentials: bytes = f'{username}:{password or ""}'.encode()
+        return f'Basic {base64.b64encode(credentials).decode("ascii")}'
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[dict[str, str]] = None) -> http.client.HTTPResponse:
+        """Send a request reusing the open connection to the url host.
+
+        If the server closed the kept-alive connection in the meantime, or the connection was left in an unusable state,
+        the request is retried once on a new one. The response body must be read completely before sending another
+        request to the same host, otherwise the connection must be dropped with `discard`.
+
+        :param method: The HTTP method, e.g. GET or PROPFIND.
+        :param url: The url to send the request to.
+        :param body: The optional request body.
+        :param headers: The optional request headers.
+        :return: The `http.client.HTTPResponse` of the request.
+        """
+        split_url: urllib.parse.SplitResult = urllib.parse.urlsplit(url)
+        path: str = urllib.parse.urlunsplit(('', '', split_url.path or '/', split_url.query, ''))
+        headers = dict(headers or {})
+        if (authorization := self.get_authorization(split_url)) is not None:
+            headers.setdefault('Authorization', authorization)
+
+        for attempt in range(2):
+            connection: http.client.HTTPConnection = self.get_connection(split_url)
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                return connection.getresponse()
+            except (http.client.RemoteDisconnected, http.client.ResponseNotReady, http.client.CannotSendRequest,
+                    BrokenPipeError, ConnectionResetError):
+                connection.close()
+                if attempt:
+                    raise
+                logging.info(f'Connection to {split_url.hostname} was closed, reconnecting')
+
+    def discard(self, url: str, response: http.client.HTTPResponse) -> None:
+        """Drop a response that could not be read completely, along with its connection.
+
+        A kept-alive connection cannot send another request until the previous response has been read, so after a
+        timeout or an interrupted download it is closed, and the next request to the host opens a new one.
+
+        :param url: The url of the response.
+        :param response: The response to drop.
+        :return: `None`.
+        """
+        response.close()
+        split_url: urllib.parse.SplitResult = urllib.parse.urlsplit(url)
+        key: tuple[str, str, Optional[int]] = (split_url.scheme, split_url.hostname, split_url.port)
+        if (connection := self.connections.pop(key, None)) is not None:
+            connection.close()
+
+    def read(self, url: str, response: http.client.HTTPResponse) -> bytes:
+        """Read the whole body of a response, dropping the connection if the read fails.
+
+        :param url: The url of the response.
+        :param response: The response to read.
+        :return: The response body.
+        """
+        try:
+            return response.read()
+        except BaseException:
+            self.discard(url, response)
+            raise
+
+    def get(self, url: str) -> bytes:
+        """Download the whole content of the given url.
+
+        :param url: The url to download.
+        :return: The response body.
+        """
+        response: http.client.HTTPResponse = self.request('GET', url)
+        content: bytes = self.read(url, response)
+        self.raise_for_status(response, url)
+        return content
+
+    def stream(self, url: str) -> Iterator[bytes]:
+        """Download the content of the given url in chunks.
+
+        If the download fails, or the iterator is not consumed completely, the connection is dropped. A body shorter
+        than its `Content-Length` raises `http.client.IncompleteRead`, since reading in chunks does not check it.
+
+        :param url: The url to download.
+        :return: An iterator over the chunks of the response body.
+        """
+        response: http.client.HTTPResponse = self.request('GET', url)
+        if not self.is_success(response):
+            self.read(url, response)
+            self.raise_for_status(response, url)
+
+        try:
+            while chunk := response.read(self.CHUNK_SIZE):
+                yield chunk
+            if response.length:
+                raise http.client.IncompleteRead(b'', response.length)
+        except BaseException:
+            self.discard(url, response)
+            raise
+
+    @staticmethod
+    def is_success(response: http.client.HTTPResponse) -> bool:
+        """Check if the response status is a 2xx one.
+
+        Redirects are not followed, so they are not successful either: their body must not be mistaken for the
+        requested content.
+
+        :param response: The response to check.
+        :return: `True` if the status is between 200 and 299, `False` otherwise.
+        """
+        return 200 <= response.status < 300
+
+    @classmethod
+    def raise_for_status(cls, response: http.client.HTTPResponse, url: str) -> None:
+        """Raise an error if the response status is not successful.
+
+        :param response: The response to check.
+        :param url: The requested url, used in the error message.
+        :return: `None`.
+        """
+        if not cls.is_success(response):
+            raise ConnectionError(f'Request to {url} failed with status {response.status} {response.reason}')
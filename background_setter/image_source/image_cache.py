@@ -0,0 +1,175 @@
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import time
+from typing import Iterable, Optional
+
+
+class ImageCache:
+    """A content-addressed local cache for images downloaded from a remote source.
+
+    Every image is stored once under the SHA-256 digest of its content, so the same wallpaper published under several
+    remote names only takes up disk space once. A small JSON index maps each remote image name to its digest.
+
+    Args:
+        cache_path (pathlib.Path): The directory where the cached images and the index are stored.
+        max_size (int | None): The maximum size in bytes of the cached images, `None` for no limit.
+
+    Attributes:
+        cache_path (pathlib.Path): The directory where the cached images and the index are stored.
+        max_size (int | None): The maximum size in bytes of the cached images, `None` for no limit.
+        objects_path (pathlib.Path): The directory containing the content-addressed image files.
+        index_path (pathlib.Path): The path to the JSON index mapping image names to digests.
+        index (dict[str, str]): The mapping between image names and content digests.
+    """
+
+    CHUNK_SIZE: int = 64 * 1024
+
+    def __init__(self, cache_path: pathlib.Path, max_size: Optional[int] = None) -> None:
+        self.cache_path: pathlib.Path = cache_path.expanduser()
+        self.max_size: Optional[int] = max_size
+        self.objects_path: pathlib.Path = self.cache_path / 'objects'
+        self.index_path: pathlib.Path = self.cache_path / 'index.json'
+        self.index: dict[str, str] = self.load_index()
+
+    def load_index(self) -> dict[str, str]:
+        """Load the index mapping image names to content digests, or an empty one if the file does not exist.
+
+        A corrupted index is discarded, the images will simply be downloaded again.
+
+        :return: A dictionary mapping image names to the digest of their content.
+        """
+        if not self.index_path.exists():
+            return {}
+
+        try:
+            with self.index_path.open('r', encoding='utf-8') as f:
+                return json.load(f)
+        except json.JSONDecodeError as e:
+            logging.warning(f'Cannot read the cache index {self.index_path}, starting with an empty one: {e}')
+            return {}
+
+    def dump_index(self) -> None:
+        """Dump the index mapping image names to content digests into a JSON file.
+
+        The index is written to a temporary file first and then moved over the old one, so a run killed while writing
+        never leaves a truncated index.
+
+        :return: `None`.
+        """
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_path, suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_name, self.index_path)
+        except BaseException:
+            pathlib.Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def object_path(self, digest: str, suffix: str) -> pathlib.Path:
+        """Return the path where the content with the given digest is stored.
+
+        :param digest: The hex SHA-256 digest of the image content.
+        :param suffix: The file extension of the image, kept so that OpenCV can detect the image format.
+        :return: The path of the cached object, sharded by the first two characters of the digest.
+        """
+        return self.objects_path / digest[:2] / f'{digest}{suffix}'
+
+    def get(self, image_name: str) -> Optional[pathlib.Path]:
+        """Return the cached file for the given image name, if any.
+
+        :param image_name: The name identifying the image in its source.
+        :return: The path of the cached file, or `None` if the image has not been downloaded yet.
+        """
+        if (digest := self.index.get(image_name)) is None:
+            return None
+
+        path: pathlib.Path = self.object_path(digest, pathlib.PurePosixPath(image_name).suffix.lower())
+        return path if path.exists() else None
+
+    def put(self, image_name: str, chunks: Iterable[bytes]) -> pathlib.Path:
+        """Store the content of an image in the cache while hashing it.
+
+        The content is written to a temporary file first and then moved to its content-addressed location, so an
+        interrupted download never leaves a truncated image in the cache. The temporary file is removed if the download
+        fails.
+
+        :param image_name: The name identifying the image in its source.
+        :param chunks: The content of the image, as an iterable of byte chunks.
+        :return: The path of the cached file.
+        """
+        self.objects_path.mkdir(parents=True, exist_ok=True)
+        sha256 = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(dir=self.objects_path)
+        tmp_path: pathlib.Path = pathlib.Path(tmp_name)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    sha256.update(chunk)
+                    f.write(chunk)
+
+            digest: str = sha256.hexdigest()
+            path: pathlib.Path = self.object_path(digest, pathlib.PurePosixPath(image_name).suffix.lower())
+            if path.exists():
+                tmp_path.unlink()
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path.replace(path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        self.index[image_name] = digest
+        return path
+
+    def touch(self, path: pathlib.Path) -> None:
+        """Mark a cached file as just used, so that it is the last one to be evicted.
+
+        Only the access time is updated: the modification time is used to detect changed files and is kept as is.
+
+        :param path: The path of the cached file.
+        :return: `None`.
+        """
+        os.utime(path, ns=(time.time_ns(), path.stat().st_mtime_ns))
+
+    def forget(self, image_names: Iterable[str]) -> None:
+        """Remove the given images from the index. Their content is deleted by the next `collect_garbage`.
+
+        :param image_names: The names of the images to remove.
+        :return: `None`.
+        """
+        for image_name in image_names:
+            self.index.pop(image_name, None)
+
+    def collect_garbage(self) -> None:
+        """Delete the cached files that no image refers to anymore, then the least recently used ones until the cache
+        fits in `max_size`.
+
+        :return: `None`.
+        """
+        referenced: dict[pathlib.Path, list[str]] = {}
+        for image_name, digest in self.index.items():
+            path: pathlib.Path = self.object_path(digest, pathlib.PurePosixPath(image_name).suffix.lower())
+            referenced.setdefault(path, []).append(image_name)
+
+        objects: list[tuple[pathlib.Path, os.stat_result]] = []
+        for path in self.objects_path.glob('*/*'):
+            if path not in referenced:
+                path.unlink(missing_ok=True)
+            elif path.is_file():
+                objects.append((path, path.stat()))
+
+        if self.max_size is None:
+            return
+
+        size: int = sum(stat.st_size for _, stat in objects)
+        for path, stat in sorted(objects, key=lambda item: item[1].st_atime_ns):
+            if size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            self.forget(referenced[path])
+            size -= stat.st_size
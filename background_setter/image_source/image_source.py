@@ -0,0 +1,125 @@
+import http.client
+import logging
+import pathlib
+import random
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class ImageSource(ABC):
+    """
+    The `ImageSource` class is an abstract base class for the places background images are read from, such as a local
+    folder or a remote server. Images are identified by a string name, which is what gets stored in the used images.
+    """
+
+    AVAILABLE_EXTENSIONS: tuple[str, str, str] = ('jpg', 'jpeg', 'png')
+    NETWORK_ERRORS: tuple[type[Exception], ...] = (OSError, http.client.HTTPException)
+
+    @classmethod
+    def is_image(cls, name: str) -> bool:
+        """
+        This function checks if the given file name has one of the supported image extensions.
+
+        :param name: The file name or url to check
+        :type name: str
+        :return: `True` if the name ends with one of the available extensions, `False` otherwise.
+        """
+        return pathlib.PurePosixPath(name).suffix.lower().lstrip('.') in cls.AVAILABLE_EXTENSIONS
+
+    @abstractmethod
+    def list_images(self) -> list[str]:
+        """
+        The function `list_images()` returns the names of all the images available in the source.
+        """
+        pass
+
+    @abstractmethod
+    def get_local_path(self, image_name: str) -> Optional[pathlib.Path]:
+        """
+        This function returns the local path of an image without downloading it.
+
+        :param image_name: The name of the image, as returned by `list_images()`
+        :type image_name: str
+        :return: The local path of the image, or `None` if the image is not available locally.
+        """
+        pass
+
+    @abstractmethod
+    def fetch(self, image_name: str) -> pathlib.Path:
+        """
+        This function makes an image available locally, downloading it if needed, and returns its local path.
+
+        :param image_name: The name of the image, as returned by `list_images()`
+        :type image_name: str
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        This function releases the resources held by the source, such as open connections.
+        :return: `None`.
+        """
+        return
+
+    def choose_image(self, available_images: list[str]) -> str:
+        """
+        This function picks the next background image among the available ones.
+
+        Images that are already available locally are preferred, so that the images prefetched by a previous run are
+        the ones actually picked and no download is needed.
+
+        :param available_images: The names of the images that can be picked
+        :type available_images: list[str]
+        :return: The name of the picked image.
+        """
+        local_images: list[str] = [image for image in available_images if self.get_local_path(image) is not None]
+        return random.choice(local_images or available_images)
+
+    def fetch_image(self, available_images: list[str], all_images: list[str]) -> Optional[tuple[str, pathlib.Path]]:
+        """
+        This function picks the next background image and makes it available locally.
+
+        If the picked image cannot be downloaded, e.g. because the computer is offline, an image that is already
+        available locally is picked instead, even if it has already been used: showing it again is better than not
+        updating the background at all.
+
+        :param available_images: The names of the images that can be picked
+        :type available_images: list[str]
+        :param all_images: The names of all the images of the source, used as a fallback
+        :type all_images: list[str]
+        :return: The name and the local path of the picked image, or `None` if no image can be made available.
+        """
+        if available_images:
+            image_name: str = self.choose_image(available_images)
+            try:
+                return image_name, self.fetch(image_name)
+            except self.NETWORK_ERRORS as e:
+                logging.error(f'Cannot fetch {image_name}: {e}')
+
+        local_images: list[str] = [image for image in all_images if self.get_local_path(image) is not None]
+        if not local_images:
+            return None
+
+        image_name = random.choice(local_images)
+        return image_name, self.fetch(image_name)
+
+    def prefetch(self, available_images: list[str], size: int) -> None:
+        """
+        This function downloads the images that the next runs are most likely to pick, i.e. a few of the available
+        images, so that they can be picked without waiting for the network.
+
+        :param available_images: The names of the images that can still be picked
+        :type available_images: list[str]
+        :param size: The number of images that should be available locally after prefetching
+        :type size: int
+        :return: `None`.
+        """
+        local_images: list[str] = [image for image in available_images if self.get_local_path(image) is not None]
+        remote_images: list[str] = [image for image in available_images if self.get_local_path(image) is None]
+        missing: int = max(size - len(local_images), 0)
+        for image_name in random.sample(remote_images, min(missing, len(remote_images))):
+            try:
+                self.fetch(image_name)
+            except self.NETWORK_ERRORS as e:
+                logging.warning(f'Cannot prefetch {image_name}: {e}')
+        return
@@ -0,0 +1,68 @@
+import logging
+import pathlib
+import urllib.parse
+from typing import Optional
+
+from image_source.http_index import HTTPIndexSource
+from image_source.http_session import HTTPSession
+from image_source.image_cache import ImageCache
+from image_source.image_source import ImageSource
+from image_source.image_source_type import ImageSourceType
+from image_source.local_folder import LocalFolderSource
+from image_source.webdav import WebDAVSource
+
+
+class ImageSourceFactory:
+    WEBDAV_SCHEMES: dict[str, str] = {'dav': 'http', 'davs': 'https', 'webdav': 'http', 'webdavs': 'https'}
+    HTTP_SCHEMES: tuple[str, str] = ('http', 'https')
+
+    def __init__(self, cache: ImageCache, session: Optional[HTTPSession] = None) -> None:
+        self.cache: ImageCache = cache
+        self.session: HTTPSession = session or HTTPSession()
+
+    @classmethod
+    def detect_source_type(cls, location: str) -> str:
+        """
+        This function detects the type of image source from the scheme of the given location.
+
+        :param location: A local folder path, a `dav://`/`davs://` url for a WebDAV collection or an
+        `http://`/`https://` url for a plain HTTP directory index
+        :type location: str
+        :return: a value of the `ImageSourceType` class.
+        """
+        scheme: str = urllib.parse.urlsplit(location).scheme.lower()
+        if scheme in cls.WEBDAV_SCHEMES:
+            return ImageSourceType.WEBDAV
+        elif scheme in cls.HTTP_SCHEMES:
+            return ImageSourceType.HTTP_INDEX
+        else:
+            return ImageSourceType.LOCAL
+
+    def create_image_source(self, location: str) -> ImageSource:
+        """
+        This function creates an image source object based on the given location.
+
+        Remote sources share the factory cache and HTTP session, so that connections to the same host are reused across
+        sources. Credentials embedded in a remote url are registered on the session and removed from the url, so they
+        never end up in the image names stored in the used images.
+
+        :param location: A local folder path or a remote url, see `detect_source_type`
+        :type location: str
+        :return: an instance of a class that implements the ImageSource interface.
+        """
+        source_type: str = self.detect_source_type(location)
+        if source_type == ImageSourceType.LOCAL:
+            return LocalFolderSource(pathlib.Path(location))
+
+        url: urllib.parse.SplitResult = urllib.parse.urlsplit(location)
+        scheme: str = self.WEBDAV_SCHEMES.get(url.scheme.lower(), url.scheme.lower())
+        if url.username is not None:
+            self.session.add_credentials(url.hostname, urllib.parse.unquote(url.username),
+                                         urllib.parse.unquote(url.password or ''))
+        netloc: str = url.hostname if url.port is None else f'{url.hostname}:{url.port}'
+        base_url: str = urllib.parse.urlunsplit((scheme, netloc, url.path, url.query, ''))
+
+        logging.info(f'Reading images from {source_type} source {base_url}')
+        if source_type == ImageSourceType.WEBDAV:
+            return WebDAVSource(base_url, self.cache, self.session)
+        return HTTPIndexSource(base_url, self.cache, self.session)
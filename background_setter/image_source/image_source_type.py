@@ -0,0 +1,4 @@
+class ImageSourceType:
+    LOCAL: str = 'local'
+    WEBDAV: str = 'webdav'
+    HTTP_INDEX: str = 'http_index'
@@ -0,0 +1,64 @@
+import pathlib
+import random
+from typing import Optional
+
+from image_source.image_source import ImageSource
+
+
+class LocalFolderSource(ImageSource):
+    def __init__(self, folder_path: pathlib.Path) -> None:
+        self.folder_path: pathlib.Path = folder_path.expanduser()
+
+    def list_images(self) -> list[str]:
+        """
+        This function returns the paths of all the images in the folder with extensions of jpg, jpeg, or png.
+        :return: A list of strings, where each string is the path to an image file in the folder.
+        """
+        images_available: set[str] = set()
+        for ext in self.AVAILABLE_EXTENSIONS:
+            images_available.update(str(path) for path in self.folder_path.glob(f'*.{ext}'))
+        return list(images_available)
+
+    def get_local_path(self, image_name: str) -> Optional[pathlib.Path]:
+        """
+        This function returns the path of the image, since local images are always available.
+
+        :param image_name: The path of the image
+        :type image_name: str
+        :return: The image path, or `None` if the file does not exist anymore.
+        """
+        path: pathlib.Path = pathlib.Path(image_name)
+        return path if path.exists() else None
+
+    def fetch(self, image_name: str) -> pathlib.Path:
+        """
+        This function returns the path of the image, no download is needed for local images.
+
+        :param image_name: The path of the image
+        :type image_name: str
+        :return: The image path.
+        """
+        return pathlib.Path(image_name)
+
+    def choose_image(self, available_images: list[str]) -> str:
+        """
+        This function picks the next background image among the available ones. Local images are always available,
+        so there is no need to check which ones are already local.
+
+        :param available_images: The paths of the images that can be picked
+        :type available_images: list[str]
+        :return: The path of the picked image.
+        """
+        return random.choice(available_images)
+
+    def prefetch(self, available_images: list[str], size: int) -> None:
+        """
+        This function does nothing, local images never need to be downloaded.
+
+        :param available_images: The paths of the images that can still be picked
+        :type available_images: list[str]
+        :param size: The number of images that should be available locally after prefetching
+        :type size: int
+        :return: `None`.
+        """
+        return
@@ -0,0 +1,100 @@
+import logging
+import pathlib
+import xml.etree.ElementTree as ElementTree
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from image_source.http_session import HTTPSession
+from image_source.image_cache import ImageCache
+from image_source.image_source import ImageSource
+
+
+class RemoteImageSource(ImageSource, ABC):
+    """
+    The `RemoteImageSource` class is an abstract base class for the sources reached over HTTP. Images are named by their
+    url, downloaded through a persistent `HTTPSession` and stored in a content-addressed `ImageCache`.
+    """
+
+    def __init__(self, url: str, cache: ImageCache, session: Optional[HTTPSession] = None) -> None:
+        self.url: str = url if url.endswith('/') else f'{url}/'
+        self.cache: ImageCache = cache
+        self.session: HTTPSession = session or HTTPSession()
+
+    @abstractmethod
+    def list_remote_images(self) -> list[str]:
+        """
+        The function `list_remote_images()` asks the server for the urls of all the images available in the source.
+        """
+        pass
+
+    def list_images(self) -> list[str]:
+        """
+        This function returns the urls of all the images available in the source.
+
+        If the server cannot be reached, the images of the source that are in the local cache are returned instead, so
+        that the cached images can still be used while offline. Otherwise, the cached images that the server does not
+        list anymore are removed from the cache.
+        :return: A list of strings, where each string is the url of an image.
+        """
+        try:
+            images: list[str] = self.list_remote_images()
+        except (*self.NETWORK_ERRORS, ElementTree.ParseError) as e:
+            logging.error(f'Cannot list the images of {self.url}, using the cached ones: {e}')
+            return self.list_cached_images()
+
+        listed_images: set[str] = set(images)
+        self.cache.forget([image_name for image_name in self.cache.index
+                           if self.is_own_image(image_name) and image_name not in listed_images])
+        return images
+
+    def is_own_image(self, image_name: str) -> bool:
+        """
+        This function checks if an image lies directly in the folder of the source. Images of sub-folders are left
+        out, since they may belong to another source.
+
+        :param image_name: The url of the image
+        :type image_name: str
+        :return: `True` if the image is directly in the source folder, `False` otherwise.
+        """
+        return image_name.startswith(self.url) and '/' not in image_name[len(self.url):]
+
+    def list_cached_images(self) -> list[str]:
+        """
+        This function returns the urls of the images of the source that are in the local cache.
+        :return: A list of strings, where each string is the url of a cached image.
+        """
+        return [image_name for image_name in self.cache.index
+                if self.is_own_image(image_name) and self.cache.get(image_name) is not None]
+
+    def get_local_path(self, image_name: str) -> Optional[pathlib.Path]:
+        """
+        This function returns the cached copy of the image, if it has already been downloaded.
+
+        :param image_name: The url of the image
+        :type image_name: str
+        :return: The path of the cached image, or `None` if the image is not in the cache.
+        """
+        return self.cache.get(image_name)
+
+    def fetch(self, image_name: str) -> pathlib.Path:
+        """
+        This function returns the cached copy of the image, downloading it first if it is not in the cache.
+
+        :param image_name: The url of the image
+        :type image_name: str
+        :return: The path of the cached image.
+        """
+        if (path := self.cache.get(image_name)) is not None:
+            self.cache.touch(path)
+            return path
+        return self.cache.put(image_name, self.session.stream(image_name))
+
+    def close(self) -> None:
+        """
+        This function cleans up the cache, saves its index and closes the open connections.
+        :return: `None`.
+        """
+        self.cache.collect_garbage()
+        self.cache.dump_index()
+        self.session.close()
+        return
@@ -0,0 +1,38 @@
+import http.client
+import urllib.parse
+import xml.etree.ElementTree as ElementTree
+
+from image_source.remote_source import RemoteImageSource
+
+
+class WebDAVSource(RemoteImageSource):
+    """
+    An image source reading a WebDAV collection, such as a Nextcloud folder exposed at
+    `https://<host>/remote.php/dav/files/<user>/<folder>`.
+    """
+
+    PROPFIND_BODY: bytes = (b'<?xml version="1.0" encoding="utf-8"?>'
+                            b'<d:propfind xmlns:d="DAV:"><d:prop><d:resourcetype/></d:prop></d:propfind>')
+
+    def list_remote_images(self) -> list[str]:
+        """
+        This function lists the WebDAV collection with a depth 1 PROPFIND request and returns the urls of all the
+        images it contains. Sub-collections are skipped, even if their name looks like an image.
+        :return: A list of strings, where each string is the url of an image in the collection.
+        """
+        response: http.client.HTTPResponse = self.session.request(
+            'PROPFIND', self.url, body=self.PROPFIND_BODY,
+            headers={'Depth': '1', 'Content-Type': 'application/xml; charset=utf-8'})
+        content: bytes = self.session.read(self.url, response)
+        self.session.raise_for_status(response, self.url)
+
+        images_available: set[str] = set()
+        for dav_response in ElementTree.fromstring(content).iter('{DAV:}response'):
+            href: str = dav_response.findtext('{DAV:}href', default='')
+            if dav_response.find('.//{DAV:}resourcetype/{DAV:}collection') is not None:
+                continue
+
+            url: str = urllib.parse.urljoin(self.url, href)
+            if self.is_image(urllib.parse.unquote(urllib.parse.urlsplit(url).path)):
+                images_available.add(url)
+        return list(images_available)
@@ -3,8 +3,8 @@
 import argparse
 import configparser
 import datetime
+import logging
 import pathlib
-import random
 import sys
 import zoneinfo
 
@@ -12,19 +12,26 @@ import cv2
 from screen.screen import Screen
 from client.client import BackgroundSetterClient
 from dektop.desktop import Desktop
+from duplicates.duplicate_index import DuplicateIndex
+from image_source.image_cache import ImageCache
+from image_source.image_source import ImageSource
+from image_source.image_source_factory import ImageSourceFactory
+from image_source.image_source_type import ImageSourceType
 from screen.screen_orientation import ScreenOrientation
 
 
 def validate_args(args: list[str]) -> bool:    # sourcery skip: use-any
-    """Check if all the arguments in a list exist as valid paths.
+    """Check if all the arguments in a list exist as valid paths or are remote urls.
 
-    :param args: args is a list of strings that represent file paths. The function is checking if each path exists and
-    returns True if all paths exist, otherwise it returns False
+    :param args: args is a list of strings that represent file paths or remote urls. The function is checking if each
+    local path exists and returns True if all paths exist, otherwise it returns False
     :type args: list[str]
     :return: The function `validate_args` is returning a boolean value. It returns `True` if all the arguments in the
-    input list `args` are non-empty strings that represent existing paths in the file system, and `False` otherwise.
+    input list `args` are non-empty strings that represent existing paths in the file system or remote urls, and `False`
+    otherwise.
     """
-    return next((False for arg in args if not arg or not pathlib.Path(arg).exists()), True)
+    return next((False for arg in args if not arg or (ImageSourceFactory.detect_source_type(arg) ==
+                                                      ImageSourceType.LOCAL and not pathlib.Path(arg).exists())), True)
 
 
 def load_config() -> configparser.ConfigParser:
@@ -37,22 +44,15 @@ def load_config() -> configparser.ConfigParser:
     return data
 
 
-def get_all_images_orientation(folder_path: pathlib.Path) -> list[pathlib.Path | None]:
-    """Return a list of file paths for all images in a given folder path with extensions of jpg, jpeg, or png.
+def get_all_images_orientation(source: ImageSource) -> list[str]:
+    """Return a list of names for all images available in a given image source with extensions of jpg, jpeg, or png.
 
-    :param folder_path: The folder path is a pathlib.Path object that represents the directory where the images are
-    stored
-    :type folder_path: pathlib.Path
-    :return: The function `get_all_images_orientation` returns a list of strings, where each string is the path to an
-    image file in the specified folder path that has one of the extensions "jpg", "jpeg", or "png".
+    :param source: The image source, i.e. a local folder or a remote WebDAV or HTTP index, where the images are stored
+    :type source: ImageSource
+    :return: The function `get_all_images_orientation` returns a list of strings, where each string is the name of an
+    image in the source, i.e. its path for local folders or its url for remote sources.
     """
-    available_extensions: tuple[str, str, str] = ("jpg", "jpeg", "png")
-
-    images_available: set[pathlib.Path | None] = set()
-    for ext in available_extensions:
-        images_available.update(pathlib.Path(folder_path).glob(f"*.{ext}"))
-
-    return list(images_available)
+    return source.list_images()
 
 
 def define_cli_args() -> argparse.ArgumentParser:
@@ -88,7 +88,7 @@ if __name__ == "__main__":
     config: configparser.ConfigParser = load_config()
     parser: argparse.ArgumentParser = define_cli_args()
     arguments: argparse.Namespace = parser.parse_args([])
-    if not validate_args(list(arguments.__dict__.values())):
+    if not validate_args([arguments.vertical, arguments.horizontal]):
         sys.exit(-1)
 
     client: BackgroundSetterClient = BackgroundSetterClient(pathlib.Path(config["project"]["used_images_path"]))
@@ -98,17 +98,43 @@ if __name__ == "__main__":
         desktop.window_protocol.update_background_image(pathlib.Path(config["project"]["backgroun_path"]).expanduser())
         sys.exit()
 
-    for scr in desktop.screens:
-        path: str = arguments.vertical if scr.orientation == ScreenOrientation.VERTICAL else arguments.horizontal
-        all_images: list[pathlib.Path | None] = get_all_images_orientation(pathlib.Path(path))
-        available_images: list[str] = client.get_available_images(all_images, scr.orientation)
-
-        image_path: str = str(random.choice(available_images))
-
-        resize_background_to_screen_resolution(desktop, scr)
-
-        client.update_used_images(image_path, scr.orientation)
-        client.update_used_images_last_update()
+    prefetch_size: int = config["project"].getint("prefetch_size", fallback=0)
+    cache_max_size: int = config["project"].getint("cache_max_size", fallback=0) * 1024 * 1024
+    source_factory: ImageSourceFactory = ImageSourceFactory(
+        ImageCache(pathlib.Path(config["project"]["cache_path"]), cache_max_size or None))
+    sources: dict[str, ImageSource] = {}
+    source_images: dict[str, tuple[list[str], dict[str, str]]] = {}
+    duplicate_index: DuplicateIndex = DuplicateIndex(
+        pathlib.Path(config["project"]["cache_path"]) / "hashes.json",
+        config["project"].get("hash_algorithm", fallback="dhash"),
+        config["project"].getint("duplicate_max_distance", fallback=6))
+    try:
+        for scr in desktop.screens:
+            path: str = arguments.vertical if scr.orientation == ScreenOrientation.VERTICAL else arguments.horizontal
+            if path not in sources:
+                sources[path] = source_factory.create_image_source(path)
+                all_images: list[str] = get_all_images_orientation(sources[path])
+                duplicate_index.update(sources[path], all_images)
+                source_images[path] = (all_images, duplicate_index.group(sources[path], all_images))
+
+            source: ImageSource = sources[path]
+            all_images, duplicates = source_images[path]
+            available_images: list[str] = client.get_available_images(all_images, scr.orientation, duplicates)
+
+            if (fetched_image := source.fetch_image(available_images, all_images)) is None:
+                logging.error(f"No image available in {path}, keeping the current background")
+                sys.exit(-1)
+
+            image_name, image_path = fetched_image
+            resize_background_to_screen_resolution(desktop, scr)
+
+            client.update_used_images(image_name, scr.orientation)
+            client.update_used_images_last_update()
+            source.prefetch([image for image in available_images if image != image_name], prefetch_size)
+    finally:
+        for source in sources.values():
+            source.close()
+        duplicate_index.dump_entries()
 
     desktop.save_new_background_image()
     desktop.window_protocol.update_background_image(pathlib.Path(config["project"]["backgroun_path"]).expanduser())
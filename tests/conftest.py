@@ -0,0 +1,114 @@
+import http.server
+import pathlib
+import sys
+import threading
+import time
+import urllib.parse
+from typing import Iterator, Optional
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent / 'background_setter'))
+
+
+class StandInServer(http.server.ThreadingHTTPServer):
+    """A local stand-in for a WebDAV server and a plain HTTP directory index.
+
+    Attributes:
+        files (dict[str, bytes]): The content of the served files, keyed by path.
+        collections (set[str]): The paths of the WebDAV sub-collections, listed by PROPFIND requests.
+        redirects (dict[str, str]): The paths answered with a 302 redirect, and their target.
+        stalled (set[str]): The paths whose body stops halfway and hangs, as on a stalled network.
+        truncated (set[str]): The paths whose body stops halfway and the connection is closed.
+        requests (list[tuple[str, str, str | None]]): The method, path and `Authorization` header of every request.
+        connections (int): The number of TCP connections accepted.
+    """
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.files: dict[str, bytes] = {}
+        self.collections: set[str] = set()
+        self.redirects: dict[str, str] = {}
+        self.stalled: set[str] = set()
+        self.truncated: set[str] = set()
+        self.requests: list[tuple[str, str, Optional[str]]] = []
+        self.connections: int = 0
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def process_request(self, request, client_address) -> None:
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: StandInServer
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def send_body(self, status: int, body: bytes, headers: Optional[dict[str, str]] = None) -> None:
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_partial_body(self, body: bytes, stall: bool) -> None:
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body[:len(body) // 2])
+        self.wfile.flush()
+        if stall:
+            time.sleep(2)
+        self.close_connection = True
+
+    def do_GET(self) -> None:
+        path: str = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path)
+        self.server.requests.append(('GET', path, self.headers.get('Authorization')))
+        if path in self.server.stalled or path in self.server.truncated:
+            self.send_partial_body(self.server.files[path], stall=path in self.server.stalled)
+        elif path in self.server.redirects:
+            self.send_body(302, b'moved', {'Location': self.server.redirects[path]})
+        elif path in self.server.files:
+            self.send_body(200, self.server.files[path])
+        elif path.endswith('/'):
+            links: str = ''.join(f'<a href="{name[len(path):]}">{name}</a>'
+                                 for name in self.server.files if name.startswith(path))
+            self.send_body(200, f'<html><body>{links}</body></html>'.encode())
+        else:
+            self.send_body(404, b'not found')
+
+    def do_PROPFIND(self) -> None:
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        path: str = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path)
+        self.server.requests.append(('PROPFIND', path, self.headers.get('Authorization')))
+        responses: list[str] = [f'<d:response><d:href>{urllib.parse.quote(path)}</d:href><d:propstat><d:prop>'
+                                f'<d:resourcetype><d:collection/></d:resourcetype></d:prop></d:propstat></d:response>']
+        for name in sorted(self.server.collections):
+            if name.startswith(path):
+                responses.append(f'<d:response><d:href>{urllib.parse.quote(name)}</d:href><d:propstat><d:prop>'
+                                 f'<d:resourcetype><d:collection/></d:resourcetype></d:prop></d:propstat></d:response>')
+        for name in sorted(self.server.files):
+            if name.startswith(path):
+                responses.append(f'<d:response><d:href>{urllib.parse.quote(name)}</d:href><d:propstat><d:prop>'
+                                 f'<d:resourcetype/></d:prop></d:propstat></d:response>')
+        self.send_body(207, f'<?xml version="1.0"?><d:multistatus xmlns:d="DAV:">{"".join(responses)}'
+                            f'</d:multistatus>'.encode())
+
+
+@pytest.fixture
+def server() -> Iterator[StandInServer]:
+    stand_in: StandInServer = StandInServer()
+    thread: threading.Thread = threading.Thread(target=stand_in.serve_forever, daemon=True)
+    thread.start()
+    yield stand_in
+    stand_in.shutdown()
+    stand_in.server_close()
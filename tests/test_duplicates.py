@@ -0,0 +1,149 @@
+import pathlib
+import random
+
+import cv2
+import numpy as np
+import pytest
+
+import duplicates.duplicate_index
+from client.client import BackgroundSetterClient
+from duplicates.duplicate_index import DuplicateIndex
+from duplicates.hash_algorithm import HashAlgorithm
+from duplicates.multi_index_hash import MultiIndexHash
+from duplicates.perceptual_hash import compute_hash
+from image_source.local_folder import LocalFolderSource
+from screen.screen_orientation import ScreenOrientation
+
+
+def test_multi_index_hash_matches_brute_force() -> None:
+    rng: random.Random = random.Random(0)
+    hashes: list[int] = [rng.getrandbits(64) for _ in range(2000)]
+    hashes += [image_hash ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for image_hash in hashes[:200]]
+    index: MultiIndexHash = MultiIndexHash()
+    for image_hash in hashes:
+        index.add(image_hash)
+
+    for query in hashes[:300]:
+        for max_distance in (0, 4, 6, 10):
+            expected: set[int] = {image_hash for image_hash in hashes
+                                  if (image_hash ^ query).bit_count() <= max_distance}
+            assert index.search(query, max_distance) == expected
+
+
+def test_available_images_returns_one_representative_per_group(tmp_path: pathlib.Path) -> None:
+    client: BackgroundSetterClient = BackgroundSetterClient(tmp_path)
+    duplicates: dict[str, str] = {'a.jpg': 'a.jpg', 'a_small.jpg': 'a.jpg', 'b.jpg': 'b.jpg'}
+
+    assert sorted(client.get_available_images(['a_small.jpg', 'a.jpg', 'b.jpg'], ScreenOrientation.HORIZONTAL,
+                                              duplicates)) == ['a.jpg', 'b.jpg']
+
+    client.update_used_images('a_small.jpg', ScreenOrientation.HORIZONTAL)
+    assert client.get_available_images(['a_small.jpg', 'a.jpg', 'b.jpg'], ScreenOrientation.HORIZONTAL,
+                                       duplicates) == ['b.jpg']
+
+
+@pytest.fixture
+def duplicate_index(tmp_path: pathlib.Path) -> DuplicateIndex:
+    return DuplicateIndex(tmp_path / 'hashes.json', max_distance=6)
+
+
+def write_image(path: pathlib.Path, seed: int, size: tuple[int, int]) -> None:
+    pattern: np.ndarray = np.random.default_rng(seed).integers(0, 256, (8, 8), dtype=np.uint8)
+    cv2.imwrite(str(path), cv2.resize(pattern, size, interpolation=cv2.INTER_CUBIC))
+
+
+@pytest.mark.parametrize('algorithm', ['dhash', 'phash'])
+def test_resized_copies_are_near_duplicates(tmp_path: pathlib.Path, algorithm: str) -> None:
+    write_image(tmp_path / 'big.jpg', 0, (1920, 1080))
+    write_image(tmp_path / 'small.jpg', 0, (960, 540))
+    write_image(tmp_path / 'other.jpg', 1, (1920, 1080))
+    big, small, other = (compute_hash(tmp_path / name, algorithm) for name in ('big.jpg', 'small.jpg', 'other.jpg'))
+
+    assert (big ^ small).bit_count() <= 6
+    assert (big ^ other).bit_count() > 6
+
+
+def test_update_only_rehashes_changed_files(tmp_path: pathlib.Path, duplicate_index: DuplicateIndex,
+                                            monkeypatch: pytest.MonkeyPatch) -> None:
+    write_image(tmp_path / 'a.jpg', 0, (640, 480))
+    write_image(tmp_path / 'b.jpg', 1, (640, 480))
+    source: LocalFolderSource = LocalFolderSource(tmp_path)
+    duplicate_index.update(source, source.list_images())
+    duplicate_index.dump_entries()
+
+    hashed: list[pathlib.Path] = []
+    monkeypatch.setattr(duplicates.duplicate_index, 'compute_hash',
+                        lambda path, algorithm: hashed.append(path) or compute_hash(path, algorithm))
+    write_image(tmp_path / 'b.jpg', 2, (320, 240))
+    reloaded: DuplicateIndex = DuplicateIndex(duplicate_index.index_path)
+    reloaded.update(source, source.list_images())
+
+    assert hashed == [tmp_path / 'b.jpg']
+
+
+def test_group_does_not_chain_beyond_max_distance(tmp_path: pathlib.Path, duplicate_index: DuplicateIndex) -> None:
+    chain: dict[str, int] = {'a.jpg': 0, 'b.jpg': 0b111, 'c.jpg': 0b111111111, 'd.jpg': 0b111111111111}
+    for name, image_hash in chain.items():
+        duplicate_index.entries[str(tmp_path / name)] = {'path': str(tmp_path / name), 'size': 0, 'mtime': 0,
+                                                         'hash': image_hash}
+
+    groups: dict[str, str] = duplicate_index.group(LocalFolderSource(tmp_path),
+                                                   [str(tmp_path / name) for name in chain])
+
+    assert groups[str(tmp_path / 'b.jpg')] == groups[str(tmp_path / 'a.jpg')]
+    assert groups[str(tmp_path / 'c.jpg')] != groups[str(tmp_path / 'a.jpg')]
+    assert groups[str(tmp_path / 'd.jpg')] == groups[str(tmp_path / 'c.jpg')]
+
+
+def test_group_prefers_local_representative(tmp_path: pathlib.Path, duplicate_index: DuplicateIndex) -> None:
+    (tmp_path / 'z.jpg').write_bytes(b'')
+    images: list[str] = [str(tmp_path / 'a.jpg'), str(tmp_path / 'z.jpg')]
+    for image_name in images:
+        duplicate_index.entries[image_name] = {'path': image_name, 'size': 0, 'mtime': 0, 'hash': 42}
+
+    groups: dict[str, str] = duplicate_index.group(LocalFolderSource(tmp_path), images)
+
+    assert set(groups.values()) == {str(tmp_path / 'z.jpg')}
+
+
+def test_dump_entries_only_rewrites_changed_index(tmp_path: pathlib.Path, duplicate_index: DuplicateIndex) -> None:
+    write_image(tmp_path / 'a.jpg', 0, (640, 480))
+    source: LocalFolderSource = LocalFolderSource(tmp_path)
+    duplicate_index.update(source, source.list_images())
+    duplicate_index.dump_entries()
+    written_ns: int = duplicate_index.index_path.stat().st_mtime_ns
+
+    reloaded: DuplicateIndex = DuplicateIndex(duplicate_index.index_path)
+    reloaded.update(source, source.list_images())
+    reloaded.dump_entries()
+
+    assert duplicate_index.index_path.stat().st_mtime_ns == written_ns
+    assert sorted(path.name for path in tmp_path.glob('*.json')) == ['hashes.json']
+
+
+def test_corrupted_index_starts_empty(tmp_path: pathlib.Path, duplicate_index: DuplicateIndex) -> None:
+    write_image(tmp_path / 'a.jpg', 0, (640, 480))
+    source: LocalFolderSource = LocalFolderSource(tmp_path)
+    duplicate_index.update(source, source.list_images())
+    duplicate_index.dump_entries()
+    duplicate_index.index_path.write_text(duplicate_index.index_path.read_text()[:20])
+
+    reloaded: DuplicateIndex = DuplicateIndex(duplicate_index.index_path)
+    assert reloaded.entries == {}
+
+    reloaded.update(source, source.list_images())
+    reloaded.dump_entries()
+    assert DuplicateIndex(duplicate_index.index_path).entries == duplicate_index.entries
+
+
+@pytest.mark.parametrize(('algorithm', 'expected'), [('pHash', HashAlgorithm.PHASH), (' dhash ', HashAlgorithm.DHASH),
+                                                     ('ahash', HashAlgorithm.DHASH)])
+def test_hash_algorithm_is_validated_at_startup(tmp_path: pathlib.Path, algorithm: str, expected: str) -> None:
+    write_image(tmp_path / 'a.jpg', 0, (640, 480))
+    source: LocalFolderSource = LocalFolderSource(tmp_path)
+    duplicate_index: DuplicateIndex = DuplicateIndex(tmp_path / 'hashes.json', algorithm)
+
+    duplicate_index.update(source, source.list_images())
+
+    assert duplicate_index.algorithm == expected
+    assert len(duplicate_index.entries) == 1
@@ -0,0 +1,234 @@
+import http.client
+import pathlib
+
+import pytest
+
+from image_source.http_index import HTTPIndexSource
+from image_source.http_session import HTTPSession
+from image_source.image_cache import ImageCache
+from image_source.image_source_factory import ImageSourceFactory
+from image_source.local_folder import LocalFolderSource
+from image_source.webdav import WebDAVSource
+
+
+@pytest.fixture(autouse=True)
+def no_netrc(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    monkeypatch.setenv('HOME', str(tmp_path))
+
+
+@pytest.fixture
+def cache(tmp_path: pathlib.Path) -> ImageCache:
+    return ImageCache(tmp_path / 'cache')
+
+
+@pytest.fixture
+def library(server) -> None:
+    server.files.update({'/lib/a.jpg': b'first', '/lib/b.png': b'second', '/lib/notes.txt': b'text'})
+
+
+def cached_objects(cache: ImageCache) -> list[pathlib.Path]:
+    return [path for path in cache.objects_path.rglob('*') if path.is_file()]
+
+
+def test_local_folder_lists_only_images(tmp_path: pathlib.Path) -> None:
+    for name in ('a.jpg', 'b.png', 'c.txt'):
+        (tmp_path / name).write_bytes(b'')
+
+    assert sorted(LocalFolderSource(tmp_path).list_images()) == [str(tmp_path / 'a.jpg'), str(tmp_path / 'b.png')]
+
+
+def test_http_index_lists_only_images(server, library, cache: ImageCache) -> None:
+    source: HTTPIndexSource = ImageSourceFactory(cache).create_image_source(f'{server.url}/lib')
+
+    assert isinstance(source, HTTPIndexSource)
+    assert sorted(source.list_images()) == [f'{server.url}/lib/a.jpg', f'{server.url}/lib/b.png']
+
+
+def test_webdav_lists_images_and_skips_collections(server, library, cache: ImageCache) -> None:
+    server.collections.add('/lib/old.png/')
+    source: WebDAVSource = ImageSourceFactory(cache).create_image_source(server.url.replace('http', 'dav') + '/lib')
+
+    assert isinstance(source, WebDAVSource)
+    assert sorted(source.list_images()) == [f'{server.url}/lib/a.jpg', f'{server.url}/lib/b.png']
+
+
+def test_fetch_downloads_on_miss_and_reuses_on_hit(server, library, cache: ImageCache) -> None:
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+    image_name: str = f'{server.url}/lib/a.jpg'
+
+    assert source.get_local_path(image_name) is None
+    path: pathlib.Path = source.fetch(image_name)
+    assert path.read_bytes() == b'first'
+    assert source.fetch(image_name) == path
+    assert [request for request in server.requests if request[1] == '/lib/a.jpg'] == [('GET', '/lib/a.jpg', None)]
+
+
+def test_cache_stores_identical_content_once(server, cache: ImageCache) -> None:
+    server.files.update({'/lib/a.jpg': b'same', '/lib/copy.jpg': b'same'})
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+
+    assert source.fetch(f'{server.url}/lib/a.jpg') == source.fetch(f'{server.url}/lib/copy.jpg')
+    assert len(cached_objects(cache)) == 1
+
+
+def test_cache_index_survives_reload(server, library, cache: ImageCache) -> None:
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+    path: pathlib.Path = source.fetch(f'{server.url}/lib/a.jpg')
+    source.close()
+
+    assert ImageCache(cache.cache_path).get(f'{server.url}/lib/a.jpg') == path
+
+
+def test_corrupted_cache_index_starts_empty(server, library, cache: ImageCache) -> None:
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+    source.fetch(f'{server.url}/lib/a.jpg')
+    source.close()
+    cache.index_path.write_text(cache.index_path.read_text()[:10])
+
+    reloaded: ImageCache = ImageCache(cache.cache_path)
+
+    assert reloaded.index == {}
+    reloaded.dump_index()
+    assert [path.name for path in cache.cache_path.iterdir() if path.is_file()] == ['index.json']
+
+
+def test_images_removed_from_the_server_are_evicted(server, library, cache: ImageCache) -> None:
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+    for image_name in source.list_images():
+        source.fetch(image_name)
+    del server.files['/lib/a.jpg']
+
+    assert source.list_images() == [f'{server.url}/lib/b.png']
+    source.close()
+
+    assert list(cache.index) == [f'{server.url}/lib/b.png']
+    assert cached_objects(cache) == [source.get_local_path(f'{server.url}/lib/b.png')]
+    assert source.list_cached_images() == [f'{server.url}/lib/b.png']
+
+
+def test_listing_keeps_the_images_of_sub_folders(server, library, cache: ImageCache) -> None:
+    server.files['/lib/sub/c.jpg'] = b'third'
+    HTTPIndexSource(f'{server.url}/lib/sub', cache).fetch(f'{server.url}/lib/sub/c.jpg')
+
+    HTTPIndexSource(f'{server.url}/lib', cache).list_images()
+
+    assert f'{server.url}/lib/sub/c.jpg' in cache.index
+
+
+def test_cache_evicts_least_recently_used_images_above_max_size(server, tmp_path: pathlib.Path) -> None:
+    server.files.update({f'/lib/{name}.jpg': name.encode() * 100 for name in ('a', 'b', 'c')})
+    cache: ImageCache = ImageCache(tmp_path / 'cache', max_size=250)
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+    for name in ('a', 'b', 'c', 'a'):
+        source.fetch(f'{server.url}/lib/{name}.jpg')
+
+    source.close()
+
+    assert sorted(cache.index) == [f'{server.url}/lib/a.jpg', f'{server.url}/lib/c.jpg']
+    assert len(cached_objects(cache)) == 2
+
+
+def test_session_reuses_connection(server, library, cache: ImageCache) -> None:
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+    for image_name in source.list_images():
+        source.fetch(image_name)
+
+    assert server.connections == 1
+
+
+def test_factory_strips_credentials_from_image_names(server, library, cache: ImageCache) -> None:
+    source: WebDAVSource = ImageSourceFactory(cache).create_image_source(
+        server.url.replace('http://', 'dav://user:secret@') + '/lib')
+
+    images: list[str] = source.list_images()
+    source.fetch(images[0])
+
+    assert all('secret' not in image and 'user' not in image for image in images)
+    assert {authorization for _, _, authorization in server.requests} == {'Basic dXNlcjpzZWNyZXQ='}
+
+
+def test_redirect_is_not_cached(server, cache: ImageCache) -> None:
+    server.redirects['/lib/redir.jpg'] = '/elsewhere.jpg'
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+
+    with pytest.raises(ConnectionError):
+        source.fetch(f'{server.url}/lib/redir.jpg')
+    assert source.get_local_path(f'{server.url}/lib/redir.jpg') is None
+    assert cached_objects(cache) == []
+
+
+def test_failed_download_leaves_no_temporary_file(server, cache: ImageCache) -> None:
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+
+    with pytest.raises(ConnectionError):
+        source.fetch(f'{server.url}/lib/missing.jpg')
+    assert cached_objects(cache) == []
+
+
+def test_stalled_download_does_not_break_the_connection(server, library, cache: ImageCache) -> None:
+    server.files['/lib/slow.jpg'] = b'x' * 1000
+    server.stalled.add('/lib/slow.jpg')
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache, HTTPSession(timeout=0.5))
+
+    with pytest.raises(TimeoutError):
+        source.fetch(f'{server.url}/lib/slow.jpg')
+    assert source.fetch(f'{server.url}/lib/a.jpg').read_bytes() == b'first'
+    assert cached_objects(cache) == [source.get_local_path(f'{server.url}/lib/a.jpg')]
+
+
+def test_truncated_download_does_not_break_the_connection(server, library, cache: ImageCache) -> None:
+    server.files['/lib/cut.jpg'] = b'x' * 1000
+    server.truncated.add('/lib/cut.jpg')
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+    source.list_images()
+
+    with pytest.raises(http.client.IncompleteRead):
+        source.fetch(f'{server.url}/lib/cut.jpg')
+    assert source.fetch(f'{server.url}/lib/a.jpg').read_bytes() == b'first'
+
+
+def test_prefetch_survives_a_stalled_download(server, library, cache: ImageCache) -> None:
+    server.files['/lib/slow.jpg'] = b'x' * 1000
+    server.stalled.add('/lib/slow.jpg')
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache, HTTPSession(timeout=0.5))
+
+    source.prefetch([f'{server.url}/lib/slow.jpg'], 1)
+    assert source.fetch(f'{server.url}/lib/b.png').read_bytes() == b'second'
+
+
+def test_prefetch_downloads_candidates_and_logs_failures(server, library, cache: ImageCache) -> None:
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+    images: list[str] = [f'{server.url}/lib/a.jpg', f'{server.url}/lib/b.png', f'{server.url}/lib/missing.jpg']
+
+    source.prefetch(images, 3)
+
+    assert [source.get_local_path(image) is not None for image in images] == [True, True, False]
+
+
+def test_choose_image_prefers_cached_images(server, library, cache: ImageCache) -> None:
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+    source.fetch(f'{server.url}/lib/b.png')
+
+    assert {source.choose_image(source.list_images()) for _ in range(20)} == {f'{server.url}/lib/b.png'}
+
+
+def test_offline_source_falls_back_to_cached_images(server, library, cache: ImageCache) -> None:
+    url: str = f'{server.url}/lib'
+    online: HTTPIndexSource = HTTPIndexSource(url, cache)
+    cached_path: pathlib.Path = online.fetch(f'{url}/a.jpg')
+    online.close()
+    server.shutdown()
+    server.server_close()
+
+    offline: HTTPIndexSource = HTTPIndexSource(url, ImageCache(cache.cache_path))
+    all_images: list[str] = offline.list_images()
+
+    assert all_images == [f'{url}/a.jpg']
+    assert offline.fetch_image([f'{url}/b.png'], all_images) == (f'{url}/a.jpg', cached_path)
+
+
+def test_fetch_image_without_cached_images_returns_none(server, cache: ImageCache) -> None:
+    source: HTTPIndexSource = HTTPIndexSource(f'{server.url}/lib', cache)
+
+    assert source.fetch_image([f'{server.url}/lib/missing.jpg'], [f'{server.url}/lib/missing.jpg']) is None
+    assert cached_objects(cache) == []